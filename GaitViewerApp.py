@@ -2,12 +2,11 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import json
-import datetime
+import os
+from log_sources import read_logs, flat_name, LOG_SUFFIXES
+from session_time import drop_invalid_timestamps, rebase_timestamps, seconds_to_hms, to_wall_clock
 
 # --- Utility Functions ---
-def seconds_to_hms(seconds):
-    return str(datetime.timedelta(seconds=seconds))
-
 def compress_repeats_with_index(lst):
     if not lst:
         return [], []
@@ -79,7 +78,8 @@ def main():
     st.title("📈 Gait Analysis Viewer")
     st.markdown("Analyze knee/thigh angle phases and export gait durations.")
 
-    uploaded_files = st.file_uploader("📤 Upload one or more `.txt` files", type="txt", accept_multiple_files=True)
+    uploaded_files = st.file_uploader("📤 Upload one or more `.txt` files (or .gz/.xz/.zst/.zip)",
+                                      type=["txt", "gz", "xz", "zst", "zip"], accept_multiple_files=True)
     prefixes = st.text_input("🔍 Filter filenames with prefix (comma-separated)", value="10-33-13,14-02-29")
     prefixes = [p.strip() for p in prefixes.split(",") if p.strip()]
 
@@ -91,53 +91,57 @@ def process_uploaded_files(uploaded_files, prefixes):
     DataFrame = {}
 
     for uploaded_file in uploaded_files:
-        filename = uploaded_file.name
-        if not filename.endswith(".txt"):
+        if not uploaded_file.name.endswith(LOG_SUFFIXES):
+            st.warning(f"Skipping {uploaded_file.name}: not a .txt log or .zip bundle")
             continue
-        data = []
-        for line in uploaded_file:
-            clean = line.decode("utf-8").strip().strip('"').replace('""', '"')
-            try:
-                parsed = json.loads(clean)
-                data.append(parsed)
-            except:
-                st.warning(f"Could not parse line in {filename}")
-        df = pd.json_normalize(data)
-        if 'input' in df and 'output' in df:
-            input_df = pd.DataFrame(df['input'].tolist()).add_prefix('input')
-            output_df = pd.DataFrame(df['output'].tolist()).add_prefix('output')
-            full_df = pd.concat([df[['sn', 'time']], input_df, output_df], axis=1)
-            full_df.rename(columns={
-                'sn': 'sample_number',
-                'input0': 'mode',
-                'input1': 'phase',
-                'input4': 'knee_angle (degree)',
-                'input6': 'thigh_angle(degree)',
-                'input8': 'calf_angle(degree)',
-                'time': 'timestamp'
-            }, inplace=True)
-            DataFrame[filename.replace(".txt", "")] = full_df
+        for log_name, lines in read_logs(uploaded_file.name, uploaded_file, warn=st.warning):
+            if log_name in DataFrame:
+                st.warning(f"Skipping {log_name}: a log with the same name was already loaded")
+                continue
+            data = []
+            for line in lines:
+                clean = line.strip().strip('"').replace('""', '"')
+                try:
+                    parsed = json.loads(clean)
+                    data.append(parsed)
+                except:
+                    st.warning(f"Could not parse line in {log_name}")
+            df = pd.json_normalize(data)
+            if 'input' in df and 'output' in df:
+                input_df = pd.DataFrame(df['input'].tolist()).add_prefix('input')
+                output_df = pd.DataFrame(df['output'].tolist()).add_prefix('output')
+                full_df = pd.concat([df[['sn', 'time']], input_df, output_df], axis=1)
+                full_df.rename(columns={
+                    'sn': 'sample_number',
+                    'input0': 'mode',
+                    'input1': 'phase',
+                    'input4': 'knee_angle (degree)',
+                    'input6': 'thigh_angle(degree)',
+                    'input8': 'calf_angle(degree)',
+                    'time': 'timestamp'
+                }, inplace=True)
+                DataFrame[log_name] = full_df
 
     for file_name, df in DataFrame.items():
-        if not any(file_name.startswith(p) for p in prefixes):
+        if not any(os.path.basename(file_name).startswith(p) for p in prefixes):
             continue
 
         st.subheader(f"📁 Processing File: {file_name}")
+        df = drop_invalid_timestamps(df)
         filtered_df = df[df['mode'] == 0].reset_index(drop=True)
 
         if filtered_df.empty:
             st.warning(f"No Mode 0 data in {file_name}")
             continue
 
-        filtered_df['human_time'] = filtered_df['timestamp'] - filtered_df['timestamp'].iloc[0]
-        filtered_df['human_time'] = filtered_df['human_time'].apply(seconds_to_hms)
+        elapsed = rebase_timestamps(filtered_df['timestamp'])
+        start_epoch = filtered_df['timestamp'].iloc[0]
 
         overall_duration = df['timestamp'].iloc[-1] - df['timestamp'].iloc[0]
         gait_cycles, gait_labels, phase_labels, final_labels = label_gait_phases(filtered_df)
 
         # Gait-only duration
-        gait_only_duration = sum(filtered_df['timestamp'].iloc[end] - filtered_df['timestamp'].iloc[start]
-                                 for start, end in gait_cycles)
+        gait_only_duration = sum(elapsed[end] - elapsed[start] for start, end in gait_cycles)
 
         with st.sidebar:
             st.markdown(f"**📁 File:** `{file_name}`")
@@ -165,14 +169,13 @@ def process_uploaded_files(uploaded_files, prefixes):
 
         # Segment info
         st.markdown("### 📋 Export Phase Durations")
-        x_data = filtered_df['timestamp'] - filtered_df['timestamp'].iloc[0]
         labels = filtered_df['final_label'].tolist()
         segment_info = []
         start_idx = 0
         for i in range(1, len(labels)):
             if labels[i] != labels[i - 1]:
                 seg_label = labels[i - 1]
-                seg_start, seg_end = x_data.iloc[start_idx], x_data.iloc[i - 1]
+                seg_start, seg_end = elapsed[start_idx], elapsed[i - 1]
                 segment_info.append({
                     'Phase': seg_label,
                     'Start Time (s)': seg_start,
@@ -182,15 +185,19 @@ def process_uploaded_files(uploaded_files, prefixes):
                 start_idx = i
         segment_info.append({
             'Phase': labels[-1],
-            'Start Time (s)': x_data.iloc[start_idx],
-            'End Time (s)': x_data.iloc[-1],
-            'Duration (s)': x_data.iloc[-1] - x_data.iloc[start_idx]
+            'Start Time (s)': elapsed[start_idx],
+            'End Time (s)': elapsed[-1],
+            'Duration (s)': elapsed[-1] - elapsed[start_idx]
         })
         segment_df = pd.DataFrame(segment_info)
-        st.dataframe(segment_df)
+        # Readable times are for display only; the CSV keeps its original columns
+        st.dataframe(segment_df.assign(**{
+            'Start (h:mm:ss)': segment_df['Start Time (s)'].map(seconds_to_hms),
+            'Start Clock (UTC)': to_wall_clock(start_epoch + segment_df['Start Time (s)'])
+        }))
 
         csv = segment_df.to_csv(index=False).encode('utf-8')
-        st.download_button("⬇️ Download CSV", csv, f"{file_name}_durations.csv", "text/csv")
+        st.download_button("⬇️ Download CSV", csv, f"{flat_name(file_name)}_durations.csv", "text/csv")
 
         # Duration tables
         stance_durations = segment_df[segment_df['Phase'] == 'Stance']['Duration (s)'].reset_index(drop=True)
@@ -199,8 +206,7 @@ def process_uploaded_files(uploaded_files, prefixes):
         stance_durations = stance_durations.reindex(range(max_len))
         swing_durations = swing_durations.reindex(range(max_len))
         stance_swing_ratio = stance_durations / swing_durations
-        gait_cycle_durations = [filtered_df['timestamp'].iloc[end] - filtered_df['timestamp'].iloc[start]
-                                for start, end in gait_cycles]
+        gait_cycle_durations = [elapsed[end] - elapsed[start] for start, end in gait_cycles]
         gait_cycle_durations = pd.Series(gait_cycle_durations).reindex(range(max_len))
 
         duration_table = pd.DataFrame({
@@ -228,11 +234,11 @@ def process_uploaded_files(uploaded_files, prefixes):
 
         csv_filtered = filtered_duration_table.to_csv(index=False).encode('utf-8')
         st.download_button("⬇️ Download Filtered Durations", csv_filtered,
-                           f"{file_name}_filtered_durations.csv", "text/csv")
+                           f"{flat_name(file_name)}_filtered_durations.csv", "text/csv")
 
         csv_all = duration_table.to_csv(index=False).encode('utf-8')
         st.download_button("⬇️ Download All Durations", csv_all,
-                           f"{file_name}_all_durations.csv", "text/csv")
+                           f"{flat_name(file_name)}_all_durations.csv", "text/csv")
 
         st.success(f"🚶 Valid Step Count: {len(filtered_duration_table)}")
 
@@ -24,11 +24,13 @@ import os
 import json
 import matplotlib.pyplot as plt
 import numpy as np
+from log_sources import iter_folder_logs, flat_name
+from session_time import drop_invalid_timestamps, rebase_timestamps
 %matplotlib inline
 
 # GUI folder picker
 tkinter.Tk().withdraw()
-folder_path = filedialog.askdirectory(title="Select Folder with .txt Files")
+folder_path = filedialog.askdirectory(title="Select Folder with .txt/.gz/.xz/.zst/.zip Files")
 
 if not folder_path:
     raise ValueError(" No folder selected. Exiting script.")
@@ -39,47 +41,46 @@ folder_path = r"C:\Users\KevWal\Downloads\20250515"
 
 # ---- Load files ----
 DataFrame = {}
-for filename in os.listdir(folder_path):
-    if filename.endswith(".txt"):
-        full_path = os.path.join(folder_path, filename)
-        data = []
-        with open(full_path, "r") as file:
-            for line in file:
-                clean = line.strip().strip('"').replace('""', '"')
-                try:
-                    parsed = json.loads(clean)
-                    data.append(parsed)
-                except json.JSONDecodeError:
-                    print(f"Error decoding line in {filename}")
-        df = pd.json_normalize(data)
-        if 'input' in df and 'output' in df:
-            input_df = pd.DataFrame(df['input'].tolist()).add_prefix('input')
-            output_df = pd.DataFrame(df['output'].tolist()).add_prefix('output')
-            full_df = pd.concat([df[['sn', 'time']], input_df, output_df], axis=1)
-            full_df.rename(columns={
-                'sn': 'sample_number',
-                'input0': 'mode',
-                'input1': 'phase',
-                'input2': 'flex_damp_measure',
-                'input3': 'ext_damp_measure',
-                'input4': 'knee_angle (degree)',
-                'input5': 'knee_velocity(degree/s)',
-                'input6': 'thigh_position(degree)',
-                'input7': 'thigh_velocity(degree/s)',
-                'input8': 'calf_position(degree)',
-                'input9': 'calf_velocity(degree/s)',
-                'input10': 'calf_ang_acc_smooth(degree/s²)',
-                'input11': 'acc_abs_mag',
-                'input12': 'acc_vertical_world',
-                'input13': 'abs_knee_vel_avg(degree/s)',
-                'input14': 'knee_velocity_history',
-                'input15': 'reserved',
-                'output0': 'motor_flex',
-                'output1': 'motor_extent',
-                'time': 'timestamp'
-            }, inplace=True)
-            df_name = filename.replace('.txt', '')
-            DataFrame[df_name] = full_df
+for df_name, lines in iter_folder_logs(folder_path):
+    if df_name in DataFrame:
+        print(f"Skipping {df_name}: a log with the same name was already loaded")
+        continue
+    data = []
+    for line in lines:
+        clean = line.strip().strip('"').replace('""', '"')
+        try:
+            parsed = json.loads(clean)
+            data.append(parsed)
+        except json.JSONDecodeError:
+            print(f"Error decoding line in {df_name}")
+    df = pd.json_normalize(data)
+    if 'input' in df and 'output' in df:
+        input_df = pd.DataFrame(df['input'].tolist()).add_prefix('input')
+        output_df = pd.DataFrame(df['output'].tolist()).add_prefix('output')
+        full_df = pd.concat([df[['sn', 'time']], input_df, output_df], axis=1)
+        full_df.rename(columns={
+            'sn': 'sample_number',
+            'input0': 'mode',
+            'input1': 'phase',
+            'input2': 'flex_damp_measure',
+            'input3': 'ext_damp_measure',
+            'input4': 'knee_angle (degree)',
+            'input5': 'knee_velocity(degree/s)',
+            'input6': 'thigh_position(degree)',
+            'input7': 'thigh_velocity(degree/s)',
+            'input8': 'calf_position(degree)',
+            'input9': 'calf_velocity(degree/s)',
+            'input10': 'calf_ang_acc_smooth(degree/s²)',
+            'input11': 'acc_abs_mag',
+            'input12': 'acc_vertical_world',
+            'input13': 'abs_knee_vel_avg(degree/s)',
+            'input14': 'knee_velocity_history',
+            'input15': 'reserved',
+            'output0': 'motor_flex',
+            'output1': 'motor_extent',
+            'time': 'timestamp'
+        }, inplace=True)
+        DataFrame[df_name] = full_df
 
 
 # ----  Mode filtering functions by segements ----
@@ -131,11 +132,14 @@ os.makedirs(summary_folder, exist_ok=True)
 for file_name, df in DataFrame.items():
     print(f"\n📁 Processing file: {file_name}")
 
-    df['timestamp'] = pd.to_numeric(df['timestamp'], errors='coerce')
-    df.dropna(subset=['timestamp'], inplace=True)
-    df['timestamp'] -= df['timestamp'].iloc[0]
+    df = drop_invalid_timestamps(df)
+    if df.empty:
+        print(f"No valid timestamps in {file_name}")
+        continue
+    elapsed = rebase_timestamps(df['timestamp'])  # rebased once, no per-row Series work
+    modes = df['mode'].to_numpy()
     
-    overall_duration = df['timestamp'].iloc[-1] - df['timestamp'].iloc[0]
+    overall_duration = elapsed[-1]
     # Convert overall duration to minutes and seconds
     overall_mins, overall_secs = divmod(overall_duration, 60)
     minutes_duration = f"{int(overall_mins)} min {int(overall_secs)} sec"
@@ -143,13 +147,11 @@ for file_name, df in DataFrame.items():
     mode_summary = []  # To store summary per mode
 
     for mode_value in range(9):
-        segments = find_mode_segments(df['mode'], mode_value)
+        segments = find_mode_segments(modes, mode_value)
         mode_duration = 0.0
         
         for (start_idx, end_idx) in segments:
-            seg = df.iloc[start_idx:end_idx + 1]
-            segment_duration = seg['timestamp'].iloc[-1] - seg['timestamp'].iloc[0]
-            mode_duration += segment_duration
+            mode_duration += elapsed[end_idx] - elapsed[start_idx]
 
         mode_summary.append({
             'Mode': mode_value,
@@ -168,6 +170,6 @@ for file_name, df in DataFrame.items():
           f"({minutes_duration})\n")
 
      # Save CSV inside the new folder
-    save_path = os.path.join(summary_folder, f"{file_name}_mode_summary.csv")
+    save_path = os.path.join(summary_folder, f"{flat_name(file_name)}_mode_summary.csv")
     summary_df.to_csv(save_path, index=False)
     print(f"✅ Saved summary CSV for {file_name} to {save_path}")
@@ -0,0 +1,86 @@
+# Shared log loading for PreProcessing, Mode_filter and GaitViewerApp
+# Reads .txt logs, compressed .txt.gz/.txt.xz/.txt.zst logs and .zip bundles
+import os
+import io
+import gzip
+import lzma
+import zipfile
+import zlib
+
+def open_zstd(fileobj):
+    import zstandard  # optional, only needed for .zst logs
+    # read_across_frames so multi-frame files (pzstd output, concatenated logs) are read in full
+    return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(fileobj, read_across_frames=True))
+
+DECOMPRESSORS = {
+    ".gz": lambda f: gzip.open(f, "rb"),
+    ".xz": lambda f: lzma.open(f, "rb"),
+    ".zst": open_zstd,
+}
+LOG_SUFFIXES = (".txt", ".zip") + tuple(".txt" + ext for ext in DECOMPRESSORS)
+
+try:
+    from zstandard import ZstdError
+except ImportError:  # .zst logs then fail in open_zstd with ImportError
+    ZstdError = ImportError
+
+# Truncated/corrupt archives and a missing zstandard package; zlib.error covers
+# corrupt deflate data in .gz and .zip members
+LOG_ERRORS = (OSError, EOFError, lzma.LZMAError, zlib.error, zipfile.BadZipFile, ZstdError, ImportError)
+
+def read_log_lines(stream):
+    return list(io.TextIOWrapper(stream, encoding="utf-8", errors="replace"))
+
+def read_logs(name, fileobj, warn=print):
+    # Yields (log key, text lines) for each .txt log, decompressing .gz/.xz/.zst
+    # and reading .zip members in memory so nothing is extracted to disk.
+    # The key is the path without .txt and compression suffixes, with zip members
+    # under their archive name, e.g. bundle.zip:p1/10-33-13.txt -> bundle/p1/10-33-13
+    # Each log is read in full before it is yielded, so an unreadable archive or
+    # member is reported through warn and skipped without a partial log.
+    if name.endswith(".zip"):
+        try:
+            archive = zipfile.ZipFile(fileobj)
+        except LOG_ERRORS as e:
+            warn(f"Skipping {name}: {e}")
+            return
+        with archive:
+            for member in archive.namelist():
+                if member.startswith("__MACOSX/") or not member.endswith(LOG_SUFFIXES):
+                    continue
+                try:
+                    member_file = archive.open(member)
+                except LOG_ERRORS as e:
+                    warn(f"Skipping {name}/{member}: {e}")
+                    continue
+                with member_file:
+                    yield from read_logs(name[:-len(".zip")] + "/" + member, member_file, warn)
+        return
+    ext = os.path.splitext(name)[1]
+    try:
+        if ext in DECOMPRESSORS:
+            with DECOMPRESSORS[ext](fileobj) as stream:
+                lines = read_log_lines(stream)
+            key = name[:-len(".txt" + ext)]
+        else:
+            lines = read_log_lines(fileobj)
+            key = name[:-len(".txt")]
+    except LOG_ERRORS as e:
+        warn(f"Skipping {name}: {e}")
+        return
+    yield key, lines
+
+def flat_name(log_key):
+    # Log key made safe for use as a single file name
+    return log_key.replace("/", "_")
+
+def iter_folder_logs(folder_path, warn=print):
+    for archive_name in os.listdir(folder_path):
+        if archive_name.endswith(LOG_SUFFIXES):
+            try:
+                raw = open(os.path.join(folder_path, archive_name), "rb")
+            except OSError as e:
+                warn(f"Skipping {archive_name}: {e}")
+                continue
+            with raw:
+                yield from read_logs(archive_name, raw, warn)
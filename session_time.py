@@ -0,0 +1,22 @@
+# Shared timestamp handling for Mode_filter and GaitViewerApp
+# Timestamps stay numeric (Unix epoch seconds); text is only made for rows that are shown
+import datetime
+import pandas as pd
+
+def drop_invalid_timestamps(df, column='timestamp'):
+    # Rows whose timestamp is missing or not numeric are dropped; the rest become float
+    t = pd.to_numeric(df[column], errors='coerce')
+    valid = t.notna()
+    return df[valid].assign(**{column: t[valid].astype(float)}).reset_index(drop=True)
+
+def rebase_timestamps(timestamps):
+    # Elapsed seconds from the first sample as a float array; run drop_invalid_timestamps first
+    t = timestamps.to_numpy(dtype=float)
+    return t - t[0]
+
+def seconds_to_hms(seconds):
+    return str(datetime.timedelta(seconds=seconds))
+
+def to_wall_clock(epoch_seconds):
+    # Device timestamps are Unix epoch seconds, so the result is UTC
+    return pd.to_datetime(epoch_seconds, unit='s', utc=True)